@@ -1,78 +1,186 @@
 import os
-import json
+import ssl
+import orjson
 import asyncio
 import aiohttp
+import numpy as np
 import argparse
+from yarl import URL
 from dotenv import load_dotenv
-import matplotlib.pyplot as plt
-import matplotlib.dates as mdates
 from datetime import datetime, timedelta, timezone
 
+_CONNECTOR = None
+
+
+def _get_connector():
+    # One connector (DNS cache, SSL context, keep-alive pool) per process, built on first
+    # use because it has to be created inside the running event loop
+    global _CONNECTOR
+    if _CONNECTOR is None or _CONNECTOR.closed:
+        _CONNECTOR = aiohttp.TCPConnector(limit=10, ttl_dns_cache=300, keepalive_timeout=60,
+                                          ssl=ssl.create_default_context())
+    return _CONNECTOR
+
+
+def _run(coro):
+    # asyncio.run() that closes the shared connector before the event loop goes away
+    async def runner():
+        try:
+            return await coro
+        finally:
+            if _CONNECTOR is not None and not _CONNECTOR.closed:
+                await _CONNECTOR.close()
+    return asyncio.run(runner())
+
 class WeatherLogger:
-    def __init__(self, api_key, data_file="weather_data.json"):
+    def __init__(self, api_key, data_file="weather_data.jsonl"):
         self.api_key = api_key
         self.data_file = data_file
         self.base_url = "https://api.openweathermap.org/data/2.5/weather"
+        self.group_url = "https://api.openweathermap.org/data/2.5/group"
+        # Parsed once; query strings are encoded by aiohttp from params
+        self._weather_url = URL(self.base_url)
+        self._group_url = URL(self.group_url)
+        self.city_ids_file = "city_ids.json"
         self.plots_dir = "plots"
-        os.makedirs(self.plots_dir, exist_ok=True)
-        self._init_json_file()
+        self._city_ids = None
+        self._cache = None
+        self._cache_mtime = 0
+        self._arrays_valid = False
+        # Caps in-flight HTTP requests during a fetch
+        self._sem = asyncio.Semaphore(10)
+        self._migrated = False
+
+    def _migrate_legacy_json(self):
+        # One-time conversion of the old JSON array file to one record per line,
+        # done on first access to the log rather than at startup
+        if self._migrated:
+            return
+        self._migrated = True
+
+        legacy_file = os.path.splitext(self.data_file)[0] + ".json"
+        if os.path.exists(self.data_file) or not os.path.exists(legacy_file):
+            return
+        try:
+            with open(legacy_file, 'rb') as f:
+                data = orjson.loads(f.read())
+        except (OSError, orjson.JSONDecodeError):
+            return
 
-    def _init_json_file(self):
-        if not os.path.exists(self.data_file):
-            with open(self.data_file, 'w') as f:
-                json.dump([], f)
+        # Serialize everything up front and hand it to the OS in one write
+        payload = b''.join(orjson.dumps(entry) + b'\n' for entry in data)
+        with open(self.data_file, 'wb') as f:
+            f.write(payload)
 
     def _kelvin_to_celsius(self, kelvin):
         return round(kelvin - 273.15, 2)
 
-    def _is_duplicate_entry(self, city, current_time):
-        two_hours_ago = current_time - timedelta(hours=2)
-        try:
-            with open(self.data_file, 'r') as f:
-                data = json.load(f)
-                for entry in data:
-                    if entry['city'].lower() == city.lower():
-                        entry_time = datetime.fromisoformat(entry['utc_timestamp'].replace('Z', '+00:00'))
-                        if entry_time > two_hours_ago:
-                            return True
-        except:
-            pass
-        return False
-
-    async def _fetch_weather_data(self, session: aiohttp.ClientSession, city):
+    def _parse_timestamps(self, entry):
+        # Parsed once per record and cached alongside the raw ISO strings
+        entry['_utc_dt'] = datetime.fromisoformat(entry['utc_timestamp'].replace('Z', '+00:00'))
+        entry['_local_dt'] = datetime.fromisoformat(entry['local_timestamp'].replace('Z', ''))
+        return entry
+
+    def _public_record(self, entry):
+        # Copy of a cached record without the parsed-timestamp keys, safe to hand to callers
+        return {key: value for key, value in entry.items() if not key.startswith('_')}
+
+    def _latest_per_city(self):
+        # Map lowercased city name -> most recent UTC timestamp logged for it
+        latest = {}
+        for entry in self._load_cache():
+            city = entry['city'].lower()
+            entry_time = entry['_utc_dt']
+            if city not in latest or entry_time > latest[city]:
+                latest[city] = entry_time
+        return latest
+
+    def _load_city_ids(self):
+        if self._city_ids is None:
+            try:
+                with open(self.city_ids_file, 'rb') as f:
+                    self._city_ids = orjson.loads(f.read())
+            except (OSError, orjson.JSONDecodeError):
+                self._city_ids = {}
+        return self._city_ids
+
+    def _save_city_ids(self):
+        with open(self.city_ids_file, 'wb') as f:
+            f.write(orjson.dumps(self._load_city_ids()))
+
+    def _build_record(self, item, utc_iso, local_iso):
+        return {
+            'city': item['name'],
+            'temperature': self._kelvin_to_celsius(item['main']['temp']),
+            'description': item['weather'][0]['description'],
+            'humidity': item['main']['humidity'],
+            'utc_timestamp': utc_iso,
+            'local_timestamp': local_iso
+        }
+
+    async def _fetch_city_weather(self, session: aiohttp.ClientSession, params, label, utc_iso, local_iso):
+        # One city from /weather, by name ('q') or by id; returns (HTTP status, (city id, record)),
+        # with None in place of the pair on failure and of the status on a network error
         try:
-            url = f"{self.base_url}?q={city}&appid={self.api_key}"
-            async with session.get(url) as response:
-                if response.status == 200:
-                    data = await response.json()
-                    weather_data = {
-                        'city': data['name'],
-                        'temperature': self._kelvin_to_celsius(data['main']['temp']),
-                        'description': data['weather'][0]['description'],
-                        'humidity': data['main']['humidity'],
-                        'utc_timestamp': datetime.now(timezone.utc).isoformat(),
-                        'local_timestamp': datetime.now().isoformat()
-                    }
-                    return weather_data
-                else:
-                    print(f"Error fetching data for {city}: HTTP {response.status}")
-                    return None
+            async with self._sem:
+                async with session.get(self._weather_url, params={**params, 'appid': self.api_key}) as response:
+                    if response.status == 200:
+                        data = await response.json(loads=orjson.loads)
+                        return response.status, (data['id'], self._build_record(data, utc_iso, local_iso))
+                    else:
+                        print(f"Error fetching data for {label}: HTTP {response.status}")
+                        return response.status, None
         except Exception as e:
-            print(f"Error fetching data for {city}: {e}")
-            return None
+            print(f"Error fetching data for {label}: {e}")
+            return None, None
 
-    async def fetch_and_log_weather(self, cities):
+    async def _fetch_weather_data(self, session: aiohttp.ClientSession, city_ids, utc_iso, local_iso):
+        # Up to 20 known cities in one /group call; returns ({city id: record}, ids the API
+        # reported as not found)
+        try:
+            params = {'id': ','.join(map(str, city_ids)), 'appid': self.api_key}
+            async with self._sem:
+                async with session.get(self._group_url, params=params) as response:
+                    if response.status == 200:
+                        data = await response.json(loads=orjson.loads)
+                        return {item['id']: self._build_record(item, utc_iso, local_iso)
+                                for item in data['list']}, set()
+                    elif response.status not in (400, 404):
+                        # Bad key, rate limit or server error: retrying per id would only add load
+                        print(f"Error fetching data for city ids {city_ids}: HTTP {response.status}")
+                        return {}, set()
+                    print(f"Error fetching data for city ids {city_ids}: HTTP {response.status}, retrying one by one")
+        except Exception as e:
+            print(f"Error fetching data for city ids {city_ids}: {e}")
+            return {}, set()
+
+        # One bad or stale id rejects the whole batch, so fall back to a request per id
+        tasks = [self._fetch_city_weather(session, {'id': city_id}, f"city id {city_id}", utc_iso, local_iso)
+                 for city_id in city_ids]
+        fetched = {}
+        not_found = set()
+        for city_id, (status, result) in zip(city_ids, await asyncio.gather(*tasks)):
+            if result is not None:
+                fetched[result[0]] = result[1]
+            elif status == 404:
+                not_found.add(city_id)
+        return fetched, not_found
+
+    async def fetch_and_log_weather(self, cities, session: aiohttp.ClientSession):
         print(f"\n Fetching weather data for {len(cities)} cities...")
 
         current_time = datetime.now(timezone.utc)
+        two_hours_ago = current_time - timedelta(hours=2)
+        latest_per_city = self._latest_per_city()
         valid_cities = []
         skipped_cities = []
 
         for city in cities:
-            if not self._is_duplicate_entry(city.strip(), current_time):
-                valid_cities.append(city.strip())
-            else:
+            latest = latest_per_city.get(city.lower().strip())
+            if latest and latest > two_hours_ago:
                 skipped_cities.append(city.strip())
+            else:
+                valid_cities.append(city.strip())
 
         if skipped_cities:
             print(f" Skipped {len(skipped_cities)} cities (logged within 2 hours): {', '.join(skipped_cities)}")
@@ -81,44 +189,159 @@ class WeatherLogger:
             print("No new cities to fetch data for.")
             return []
 
-        # Fetch data asynchronously
-        logged_data = []
-        async with aiohttp.ClientSession() as session:
-            tasks = [self._fetch_weather_data(session, city) for city in valid_cities]
-            results = await asyncio.gather(*tasks)
-
-            for weather_data in results:
-                if weather_data:
-                    self._save_weather_data(weather_data)
-                    logged_data.append(weather_data)
-                    print(f"{weather_data['city']}: {weather_data['temperature']}°C, {weather_data['description']}")
+        # Every record in this batch shares one sample time
+        utc_iso = current_time.isoformat()
+        local_iso = current_time.astimezone().replace(tzinfo=None).isoformat()
+
+        # Cities with a known id go up to 20 per /group request. New cities are fetched once
+        # by name; that response is logged and also tells us their id for next time.
+        city_ids = self._load_city_ids()
+        cached_ids = list(dict.fromkeys(city_ids[city.lower()] for city in valid_cities
+                                        if city.lower() in city_ids))
+        new_cities = {}
+        for city in valid_cities:
+            if city.lower() not in city_ids:
+                new_cities.setdefault(city.lower(), city)
+
+        group_tasks = [self._fetch_weather_data(session, cached_ids[i:i + 20], utc_iso, local_iso)
+                       for i in range(0, len(cached_ids), 20)]
+        new_tasks = [self._fetch_city_weather(session, {'q': city}, city, utc_iso, local_iso)
+                     for city in new_cities.values()]
+        group_results, new_results = await asyncio.gather(asyncio.gather(*group_tasks),
+                                                          asyncio.gather(*new_tasks))
+
+        fetched = {}
+        stale_ids = set()
+        for batch_fetched, batch_not_found in group_results:
+            fetched.update(batch_fetched)
+            stale_ids.update(batch_not_found)
+
+        ids_changed = False
+        for city_key, (status, result) in zip(new_cities, new_results):
+            if result is not None:
+                city_id, weather_data = result
+                city_ids[city_key] = city_id
+                fetched.setdefault(city_id, weather_data)
+                ids_changed = True
+
+        # Forget ids the API answered 404 for; those names are looked up again next time
+        for name in [name for name, city_id in city_ids.items() if city_id in stale_ids]:
+            del city_ids[name]
+            ids_changed = True
+
+        logged_data = list(fetched.values())
+
+        # File writes happen off the event loop; the log gets one append for the whole batch
+        if logged_data:
+            await asyncio.to_thread(self._save_many, logged_data)
+        if ids_changed:
+            await asyncio.to_thread(self._save_city_ids)
+
+        for weather_data in logged_data:
+            print(f"{weather_data['city']}: {weather_data['temperature']}°C, {weather_data['description']}")
 
         print(f"\n Successfully logged weather data for {len(logged_data)} cities!")
         return logged_data
 
-    def _save_weather_data(self, weather_data):
+    def _data_file_mtime(self):
         try:
-            with open(self.data_file, 'r') as f:
-                data = json.load(f)
-        except:
-            data = []
+            return os.stat(self.data_file).st_mtime_ns
+        except OSError:
+            return None
 
-        data.append(weather_data)
+    def _save_many(self, records):
+        self._migrate_legacy_json()
+        # Only keep the cache if nobody else touched the file since we loaded it
+        cache_fresh = self._cache is not None and self._data_file_mtime() == self._cache_mtime
+
+        # Append-only: one JSON record per line, all records in a single write
+        payload = b''.join(orjson.dumps(record) + b'\n' for record in records)
+        with open(self.data_file, 'ab+') as f:
+            # Start on a fresh line if the file ends in a torn record
+            f.seek(0, os.SEEK_END)
+            if f.tell():
+                f.seek(-1, os.SEEK_END)
+                if f.read(1) != b'\n':
+                    payload = b'\n' + payload
+            f.write(payload)
+
+        if cache_fresh:
+            # Parse copies so callers keep plain, JSON-serializable records
+            self._cache.extend(self._parse_timestamps(dict(record)) for record in records)
+            self._cache_mtime = self._data_file_mtime()
+        else:
+            self._cache = None
+        self._arrays_valid = False
+
+    def _load_cache(self):
+        self._migrate_legacy_json()
+        mtime = self._data_file_mtime()
+        if mtime is None:
+            return []
 
-        with open(self.data_file, 'w') as f:
-            json.dump(data, f, indent=2)
+        if self._cache is None or mtime != self._cache_mtime:
+            data = []
+            skipped = 0
+            try:
+                with open(self.data_file, 'rb') as f:
+                    for line in f:
+                        if not line.strip():
+                            continue
+                        try:
+                            entry = orjson.loads(line)
+                        except orjson.JSONDecodeError:
+                            # Typically a torn last line; keep the rest of the history
+                            skipped += 1
+                            continue
+                        data.append(self._parse_timestamps(entry))
+            except OSError:
+                # Drop the old cache and columns too, so no query keeps serving stale records
+                self._cache = None
+                self._arrays_valid = False
+                return []
+            if skipped:
+                print(f"\n Skipped {skipped} unreadable line(s) in {self.data_file}")
+            # Cache is kept oldest first so new records can simply be appended.
+            # The file is already in append (time) order, so this is a linear pass.
+            # Sorted on the parsed time: raw strings with 'Z' and '+00:00' don't compare chronologically
+            data.sort(key=lambda x: x['_utc_dt'])
+            self._cache = data
+            self._cache_mtime = mtime
+            self._arrays_valid = False
+
+        return self._cache
 
     def get_all_logs(self):
+        # Newest first, as plain copies so callers can't disturb the cache
+        return [self._public_record(log) for log in reversed(self._load_cache())]
+
+    def pretty_dump(self):
+        # The log is stored compact; this is the human-readable view of it
+        self._migrate_legacy_json()
         try:
-            with open(self.data_file, 'r') as f:
-                data = json.load(f)
-                # Sort by timestamp (newest first)
-                return sorted(data, key=lambda x: x['utc_timestamp'], reverse=True)
-        except:
-            return []
-            
+            with open(self.data_file, 'rb') as f:
+                for line in f:
+                    if line.strip():
+                        print(orjson.dumps(orjson.loads(line), option=orjson.OPT_INDENT_2).decode())
+        except (OSError, orjson.JSONDecodeError) as e:
+            print(f"\n Could not read log file {self.data_file}: {e}")
+
+    def _as_arrays(self):
+        # Column view of the logs (city, temperature, UTC epoch seconds) in stored order,
+        # rebuilt only when the cache changes
+        logs = self._load_cache()
+        if not self._arrays_valid:
+            self._array_logs = logs
+            self._cities = np.array([log['city'] for log in logs], dtype=str)
+            self._cities_lower = np.char.lower(self._cities)
+            self._temps = np.fromiter((log['temperature'] for log in logs), dtype=np.float64, count=len(logs))
+            self._utc = np.fromiter((log['_utc_dt'].timestamp() for log in logs), dtype=np.float64, count=len(logs))
+            self._local_dt = np.array([log['_local_dt'] for log in logs], dtype=object)
+            self._arrays_valid = True
+        return self._array_logs
+
     def display_logs_table(self):
-        logs = self.get_all_logs()
+        logs = self._load_cache()
         if not logs:
             return
 
@@ -127,58 +350,62 @@ class WeatherLogger:
         print(f"{'City':<15} {'Temp (°C)':<10} {'Description':<20} {'Humidity (%)':<12} {'Timestamp':<20}")
         print("-" * 100)
 
-        for log in logs:
-            timestamp = datetime.fromisoformat(log['local_timestamp'].replace('Z', '')).strftime('%Y-%m-%d %H:%M')
+        # Newest first
+        for log in reversed(logs):
+            timestamp = log['_local_dt'].strftime('%Y-%m-%d %H:%M')
             print(f"{log['city']:<15} {log['temperature']:<10} {log['description']:<20} {log['humidity']:<12} {timestamp:<20}")
 
     def get_city_avg_temp(self):
-        logs = self.get_all_logs()
-        city_temps = {}
+        logs = self._as_arrays()
+        if not logs:
+            return {}
 
-        for log in logs:
-            city = log['city']
-            if city not in city_temps:
-                city_temps[city] = []
-            city_temps[city].append(log['temperature'])
+        # Summed newest first, the same order the averages have always been computed in
+        cities, inverse = np.unique(self._cities[::-1], return_inverse=True)
+        means = np.bincount(inverse, weights=self._temps[::-1]) / np.bincount(inverse)
 
-        averages = {city: round(sum(temps) / len(temps), 2) 
-                   for city, temps in city_temps.items()}
+        averages = {str(city): round(float(mean), 2)
+                    for city, mean in zip(cities, means)}
 
         return averages
 
     def get_hottest_coldest_cities(self, last_24h=False):
-        logs = self.get_all_logs()
+        logs = self._as_arrays()
+        # Newest first, so ties go to the most recent record
+        temps = self._temps[::-1]
 
         if last_24h:
-            cutoff_time = datetime.now(timezone.utc) - timedelta(hours=24)
-            logs = [log for log in logs 
-                   if datetime.fromisoformat(log['utc_timestamp'].replace('Z', '+00:00')) > cutoff_time]
-            
-        if not logs:
+            # The last 24h form a prefix of the newest-first view; find its end by bisection
+            cutoff_ts = (datetime.now(timezone.utc) - timedelta(hours=24)).timestamp()
+            temps = temps[:len(logs) - np.searchsorted(self._utc, cutoff_ts, side='right')]
+
+        if not len(temps):
             return None, None
 
-        hottest = max(logs, key=lambda x: x['temperature'])
-        coldest = min(logs, key=lambda x: x['temperature'])
+        hottest = self._public_record(logs[len(logs) - 1 - int(np.argmax(temps))])
+        coldest = self._public_record(logs[len(logs) - 1 - int(np.argmin(temps))])
 
         return hottest, coldest
     
     def plot_temp(self, city):
-        logs = self.get_all_logs()
-        city_logs = [log for log in logs if log['city'].lower() == city.lower()]
-        if not city_logs:
+        # Imported here so options that never plot don't pay for loading matplotlib
+        import matplotlib.pyplot as plt
+        import matplotlib.dates as mdates
+
+        self._as_arrays()
+        mask = self._cities_lower == city.lower()
+        if not mask.any():
             print(f"\n No data found for city: {city}")
             return
 
         # Sort by timestamp
-        city_logs.sort(key=lambda x: x['utc_timestamp'])
-
-        timestamps = [datetime.fromisoformat(log['local_timestamp'].replace('Z', '')) 
-                     for log in city_logs]
-        temperatures = [log['temperature'] for log in city_logs]
+        order = np.argsort(self._utc[mask], kind='stable')
+        timestamps = self._local_dt[mask][order]
+        temperatures = self._temps[mask][order]
 
         plt.figure(figsize=(12, 6))
         plt.plot(timestamps, temperatures, marker='o', linewidth=2, markersize=6)
-        plt.title(f'Temperature Trend for {city_logs[0]["city"]}', fontsize=16, fontweight='bold')
+        plt.title(f'Temperature Trend for {self._cities[mask][0]}', fontsize=16, fontweight='bold')
         plt.xlabel('Date & Time', fontsize=12)
         plt.ylabel('Temperature (°C)', fontsize=12)
         plt.grid(True, alpha=0.3)
@@ -188,15 +415,16 @@ class WeatherLogger:
         plt.gca().xaxis.set_major_locator(mdates.HourLocator(interval=max(1, len(timestamps)//10)))
         plt.xticks(rotation=45)
 
-        for i, (timestamp, temp) in enumerate(zip(timestamps, temperatures)):
-            if i % max(1, len(timestamps)//8) == 0:
-                plt.annotate(f'{temp}°C', (timestamp, temp), 
-                           textcoords="offset points", xytext=(0,10), ha='center')
+        idx = np.arange(0, len(timestamps), max(1, len(timestamps)//8))
+        for timestamp, temp in zip(timestamps[idx], temperatures[idx]):
+            plt.annotate(f'{temp}°C', (timestamp, temp), 
+                       textcoords="offset points", xytext=(0,10), ha='center')
 
         plt.tight_layout()
 
         filename = f"{city.lower().replace(' ', '_')}_temp_trend.png"
         filepath = os.path.join(self.plots_dir, filename)
+        os.makedirs(self.plots_dir, exist_ok=True)
         plt.savefig(filepath, dpi=300, bbox_inches='tight')
         print(f"\n Temperature trend plot saved: {filepath}")
         plt.show()
@@ -205,6 +433,15 @@ class WeatherLogger:
 class WeatherCLI:
     def __init__(self, api_key):
         self.weather_logger = WeatherLogger(api_key)
+        self.session = None
+
+    def _create_session(self):
+        # Keep-alive connections are reused across fetches; the connector outlives the session
+        return aiohttp.ClientSession(connector=_get_connector(), connector_owner=False)
+
+    async def fetch_cities(self, cities):
+        async with self._create_session() as session:
+            return await self.weather_logger.fetch_and_log_weather(cities, session)
 
     def display_menu(self):
         print("\n" + "="*50)
@@ -226,7 +463,7 @@ class WeatherCLI:
             return
 
         cities = [city.strip() for city in cities_input.split(',')]
-        await self.weather_logger.fetch_and_log_weather(cities)
+        await self.weather_logger.fetch_and_log_weather(cities, self.session)
 
     def option_2(self):
         logs = self.weather_logger.display_logs_table()
@@ -286,48 +523,55 @@ class WeatherCLI:
         self.weather_logger.plot_temp(city)
 
     async def run(self):
-        while True:
-            try:
-                self.display_menu()
-                choice = input("\n Select an option (1-7): ").strip()
-
-                if choice == '1':
-                    await self.option_1()
-                elif choice == '2':
-                    self.option_2()
-                elif choice == '3':
-                    self.option_3()
-                elif choice == '4':
-                    self.option_4()
-                elif choice == '5':
-                    self.option_5()
-                elif choice == '6':
-                    self.option_6()
-                elif choice == '7':
-                    print("\n Thank you for using Weather Analyzer!!")
-                    break
-                else:
-                    print("\n Invalid option. Please select 1-9.")
-
-                input("\n Press Enter to continue...")
-
-            except Exception as e:
-                print(f"\n An error occurred: {e}")
-                input("\n Press Enter to continue...")
+        async with self._create_session() as session:
+            self.session = session
+            while True:
+                try:
+                    self.display_menu()
+                    choice = input("\n Select an option (1-7): ").strip()
+
+                    if choice == '1':
+                        await self.option_1()
+                    elif choice == '2':
+                        self.option_2()
+                    elif choice == '3':
+                        self.option_3()
+                    elif choice == '4':
+                        self.option_4()
+                    elif choice == '5':
+                        self.option_5()
+                    elif choice == '6':
+                        self.option_6()
+                    elif choice == '7':
+                        print("\n Thank you for using Weather Analyzer!!")
+                        break
+                    else:
+                        print("\n Invalid option. Please select 1-9.")
+
+                    input("\n Press Enter to continue...")
+
+                except Exception as e:
+                    print(f"\n An error occurred: {e}")
+                    input("\n Press Enter to continue...")
 
 def main():
     parser = argparse.ArgumentParser(description="Asynchronous Weather Logger & Analyzer")
     parser.add_argument('--api-key', help='OpenWeatherMap API key')
     parser.add_argument('--cities', help='Comma-separated list of cities to fetch weather for')
     parser.add_argument('--plot', help='Generate temperature trend plot for specified city')
+    parser.add_argument('--pretty-dump', action='store_true', help='Print all logged records as indented JSON')
 
     args = parser.parse_args()
 
-    if args.api_key and args.cities:
+    if args.pretty_dump:
+        # Reads the local log only, so no API key is needed
+        WeatherLogger(None).pretty_dump()
+
+    elif args.api_key and args.cities:
         print(args.cities)
         weather_cli = WeatherCLI(args.api_key)
         cities = [city.strip() for city in args.cities.split(',')]
-        asyncio.run(weather_cli.weather_logger.fetch_and_log_weather(cities))
+        _run(weather_cli.fetch_cities(cities))
     
     elif args.api_key and args.plot:
         weather_cli = WeatherCLI(args.api_key)
@@ -337,7 +581,7 @@ def main():
         load_dotenv()
         api_key = os.getenv("API_KEY")
         weather_cli = WeatherCLI(api_key)
-        asyncio.run(weather_cli.run())
+        _run(weather_cli.run())
 
 if __name__ == "__main__":
     main()